@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { ProcessingResult, SupportedEmotions } from '../types';
+import { ProcessingResult, SupportedEmotions, SupportedLanguages } from '../types';
 
 // Get API URL from environment variables with fallbacks
 const getApiUrl = () => {
@@ -49,6 +49,20 @@ api.interceptors.response.use(
   }
 );
 
+// Static endpoint responses are fetched once per page load and shared
+const staticResponseCache = new Map<string, Promise<unknown>>();
+
+const getStatic = <T>(url: string): Promise<T> => {
+  let pending = staticResponseCache.get(url) as Promise<T> | undefined;
+  if (!pending) {
+    pending = api.get<T>(url).then((response) => response.data);
+    // Drop failed lookups so the next call retries
+    pending.catch(() => staticResponseCache.delete(url));
+    staticResponseCache.set(url, pending);
+  }
+  return pending;
+};
+
 /**
  * Uploads the audio file and receives transcript + sentiment analysis result with precise emotions
  * @param audioFile Audio file to be processed
@@ -116,10 +130,9 @@ export const detectLanguage = async (audioFile: File) => {
  * Get supported languages
  * @returns List of supported languages
  */
-export const getSupportedLanguages = async () => {
+export const getSupportedLanguages = async (): Promise<SupportedLanguages> => {
   try {
-    const response = await api.get('/api/supported-languages');
-    return response.data;
+    return await getStatic<SupportedLanguages>('/api/supported-languages');
   } catch (error) {
     if (axios.isAxiosError(error)) {
       throw new Error(error.response?.data?.detail || 'Failed to get supported languages');
@@ -134,8 +147,7 @@ export const getSupportedLanguages = async () => {
  */
 export const getSupportedEmotions = async (): Promise<SupportedEmotions> => {
   try {
-    const response = await api.get('/api/supported-emotions');
-    return response.data;
+    return await getStatic<SupportedEmotions>('/api/supported-emotions');
   } catch (error) {
     if (axios.isAxiosError(error)) {
       throw new Error(error.response?.data?.detail || 'Failed to get supported emotions');
@@ -176,8 +188,7 @@ export const analyzeSentiment = async (text: string, language?: string) => {
  */
 export const getModelInfo = async () => {
   try {
-    const response = await api.get('/api/model-info');
-    return response.data;
+    return await getStatic<unknown>('/api/model-info');
   } catch (error) {
     if (axios.isAxiosError(error)) {
       throw new Error(error.response?.data?.detail || 'Failed to get model info');
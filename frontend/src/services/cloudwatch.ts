@@ -7,12 +7,23 @@ interface CloudWatchMetric {
   timestamp?: Date;
 }
 
+const METRICS_HEADERS = {
+  'Content-Type': 'application/json',
+};
+
 class CloudWatchService {
   private apiUrl: string;
   private metricsQueue: CloudWatchMetric[] = [];
   private batchSize = 10;
+  private maxMetricsPerRequest = 1000; // CloudWatch PutMetricData limit
+  private maxQueueSize = 1000;
+  private maxKeepaliveMetrics = 100;
+  private maxKeepaliveBytes = 60000; // browsers reject keepalive bodies over 64 KB in flight
   private flushInterval = 30000; // 30 seconds
   private timer: NodeJS.Timeout | null = null;
+  private retryAttempt = 0;
+  private retryAfter = 0;
+  private maxBackoff = 300000; // 5 minutes
   private isProduction: boolean;
 
   constructor() {
@@ -30,57 +41,132 @@ class CloudWatchService {
     }, this.flushInterval);
   }
 
-  private async flushMetrics() {
+  private async flushMetrics({ keepalive = false, ignoreBackoff = false } = {}) {
     if (this.metricsQueue.length === 0 || !this.isProduction) return;
-
-    const metricsToSend = this.metricsQueue.splice(0, this.batchSize);
+    // Back off after failures; only the final unload flush skips the wait
+    if (!ignoreBackoff && Date.now() < this.retryAfter) return;
+
+    // Drain as much as one payload can represent instead of one batchSize per request
+    let count = this.getRepresentableCount(
+      keepalive ? this.maxKeepaliveMetrics : this.maxMetricsPerRequest
+    );
+    let body = this.buildPayload(this.metricsQueue.slice(0, count));
+    // Keepalive bodies must fit the browser quota; leave the rest queued for the next flush
+    while (keepalive && count > 1 && new TextEncoder().encode(body).length > this.maxKeepaliveBytes) {
+      count = Math.floor(count / 2);
+      body = this.buildPayload(this.metricsQueue.slice(0, count));
+    }
+    const metricsToSend = this.metricsQueue.splice(0, count);
+    let serverFailure = false;
     
     try {
       const response = await fetch(`${this.apiUrl}/api/metrics`, {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          metrics: this.formatMetricsForBackend(metricsToSend),
-          source: 'frontend',
-          timestamp: new Date().toISOString()
-        })
+        keepalive, // lets the request outlive the page when flushing on unload
+        headers: METRICS_HEADERS,
+        body
       });
 
       if (!response.ok) {
+        serverFailure = true;
         throw new Error(`HTTP ${response.status}`);
       }
 
+      this.retryAttempt = 0;
+      this.retryAfter = 0;
       console.log(`📊 Sent ${metricsToSend.length} metrics to CloudWatch`);
     } catch (error) {
       console.warn('Failed to send metrics to CloudWatch:', error);
+      // A rejected keepalive fetch is usually the browser's in-flight quota, not the endpoint
+      if (serverFailure || !keepalive) {
+        // Exponential backoff with full jitter so clients don't retry in lockstep
+        const backoff = Math.min(this.flushInterval * 2 ** this.retryAttempt, this.maxBackoff);
+        this.retryAfter = Date.now() + Math.random() * backoff;
+        this.retryAttempt++;
+      }
       // Re-queue failed metrics (with limit to prevent infinite growth)
-      if (this.metricsQueue.length < 100) {
-        this.metricsQueue.unshift(...metricsToSend);
+      this.metricsQueue.unshift(...metricsToSend);
+      this.trimQueue();
+    }
+  }
+
+  // Length of the queue prefix whose payload keeps every sample: only counters with
+  // identical dimensions may share a key, anything else would overwrite an entry
+  private getRepresentableCount(limit: number): number {
+    const seen: Record<string, string> = {};
+    const end = Math.min(this.metricsQueue.length, limit);
+
+    for (let i = 0; i < end; i++) {
+      const metric = this.metricsQueue[i];
+      const key = this.getWireKey(metric);
+      const aggregationKey = this.getAggregationKey(metric);
+
+      if (key in seen && (seen[key] !== aggregationKey || this.getMetricUnit(metric.name) !== 'Count')) {
+        return i;
       }
+      seen[key] = aggregationKey;
+    }
+
+    return end;
+  }
+
+  // Drop the oldest metrics once the queue exceeds its cap
+  private trimQueue() {
+    const overflow = this.metricsQueue.length - this.maxQueueSize;
+    if (overflow > 0) {
+      this.metricsQueue.splice(0, overflow);
     }
   }
 
+  private buildPayload(metrics: CloudWatchMetric[]) {
+    return JSON.stringify({
+      metrics: this.formatMetricsForBackend(metrics),
+      source: 'frontend',
+      timestamp: new Date().toISOString()
+    });
+  }
+
   private formatMetricsForBackend(metrics: CloudWatchMetric[]) {
     const formatted: Record<string, any> = {};
+    const aggregationKeys: Record<string, string> = {};
     
     metrics.forEach(metric => {
-      const key = metric.dimensions 
-        ? `${metric.name}_${Object.values(metric.dimensions).join('_')}`
-        : metric.name;
+      const key = this.getWireKey(metric);
+      const aggregationKey = this.getAggregationKey(metric);
+      const unit = this.getMetricUnit(metric.name);
+
+      // Pre-aggregate counters so repeated events with identical dimensions become one data point
+      if (unit === 'Count' && formatted[key] && aggregationKeys[key] === aggregationKey) {
+        formatted[key].value += metric.value;
+        return;
+      }
         
+      aggregationKeys[key] = aggregationKey;
       formatted[key] = {
+        name: metric.name,
         value: metric.value,
         dimensions: metric.dimensions || {},
         timestamp: metric.timestamp || new Date(),
-        unit: this.getMetricUnit(metric.name)
+        unit
       };
     });
     
     return formatted;
   }
 
+  // Key the backend receives each metric under; kept stable for the /api/metrics contract
+  private getWireKey(metric: CloudWatchMetric): string {
+    return metric.dimensions
+      ? `${metric.name}_${Object.values(metric.dimensions).join('_')}`
+      : metric.name;
+  }
+
+  // Exact identity of a series; unlike the wire key, distinct dimension sets never collide
+  private getAggregationKey(metric: CloudWatchMetric): string {
+    const dimensions = Object.entries(metric.dimensions || {}).sort(([a], [b]) => (a < b ? -1 : 1));
+    return JSON.stringify([metric.name, dimensions]);
+  }
+
   private getMetricUnit(metricName: string): string {
     const unitMap: Record<string, string> = {
       'PageView': 'Count',
@@ -89,13 +175,18 @@ class CloudWatchService {
       'APIResponseTime': 'Milliseconds',
       'ConversationStarted': 'Count',
       'ConversationDuration': 'Seconds',
+      'ConversationMessages': 'None', // per-conversation size, not an event counter
       'EmotionDetected': 'Count',
       'EmotionConfidence': 'Percent',
       'SentimentAnalyzed': 'Count',
+      'SentimentConfidence': 'Percent',
+      'TranscriptionTime': 'Seconds',
+      'TranscriptionConfidence': 'Percent',
       'AudioRecorded': 'Count',
       'AudioDuration': 'Seconds',
       'AudioFileSize': 'Bytes',
       'WellnessActivity': 'Count',
+      'WellnessActivityDuration': 'Seconds',
       'FrontendError': 'Count',
       'Performance': 'Milliseconds'
     };
@@ -229,6 +320,8 @@ class CloudWatchService {
       dimensions,
       timestamp: new Date()
     });
+    // Keep growth bounded while flushes are backing off
+    this.trimQueue();
 
     // Flush immediately if queue is full
     if (this.metricsQueue.length >= this.batchSize) {
@@ -259,13 +352,19 @@ class CloudWatchService {
     });
   }
 
+  // Fire-and-forget flush that survives page teardown
+  flush() {
+    this.flushMetrics({ keepalive: true });
+  }
+
   // Cleanup method
   destroy() {
     if (this.timer) {
       clearInterval(this.timer);
       this.timer = null;
     }
-    this.flushMetrics(); // Send any remaining metrics
+    // Send any remaining metrics without blocking unload; this is the last chance, so skip backoff
+    this.flushMetrics({ keepalive: true, ignoreBackoff: true });
   }
 }
 
@@ -279,4 +378,11 @@ if (typeof window !== 'undefined') {
   window.addEventListener('beforeunload', () => {
     cloudWatchService.destroy();
   });
+
+  // beforeunload is unreliable on mobile; hand queued metrics off when the tab is hidden
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') {
+      cloudWatchService.flush();
+    }
+  });
 }
\ No newline at end of file